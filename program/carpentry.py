@@ -1,21 +1,106 @@
 # -Libaries-
 import sys  # System parameters and functions
 import csv  # Read/write inventory report file
+import io   # Buffered file writing for the CSV export
 import os   # Handles the file paths so it works on any operating system
 
 # -PyQt6 UI Framework-
 from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QHBoxLayout, 
-    QVBoxLayout, QPushButton, QStackedWidget, QLabel, 
-    QLineEdit, QMessageBox, QTableWidget, QTableWidgetItem, 
+    QApplication, QMainWindow, QWidget, QHBoxLayout,
+    QVBoxLayout, QPushButton, QStackedWidget, QLabel,
+    QLineEdit, QMessageBox, QTableView, QAbstractItemView,
     QHeaderView, QCompleter, QFrame
 )
-from PyQt6.QtCore import Qt, QStringListModel
+from PyQt6.QtCore import Qt, QStringListModel, QAbstractTableModel, QModelIndex, QTimer
 from PyQt6.QtGui import QColor
 
 # -Local Modules-
 import database  # This connects carpentry.py to database.py
 
+# -Table Models-
+class BaseTableModel(QAbstractTableModel):
+    """
+    Shared model logic for the three tables. It holds the rows as a plain
+    Python list so Qt only asks for the cells that are actually on screen,
+    instead of us building a widget for every single cell.
+    """
+    HEADERS = []  # Each subclass fills this in with its column titles
+
+    def __init__(self):
+        super().__init__()
+        self._rows = []  # List of tuples, one tuple per table row
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        # Qt only calls this for visible cells, so big tables stay fast.
+        # Rows are stringified once on the way in, so this is a pure lookup
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def set_rows(self, rows):
+        """Swaps in a fresh set of rows and tells the view to redraw once.
+        Every cell is converted to a string here, once, rather than on
+        each repaint."""
+        self.beginResetModel()
+        self._rows = [tuple(map(str, row)) for row in rows]
+        self.endResetModel()
+
+    def append_row(self, row):
+        """Adds one row to the bottom without rebuilding the whole table."""
+        pos = len(self._rows)
+        self.beginInsertRows(QModelIndex(), pos, pos)
+        self._rows.append(tuple(map(str, row)))
+        self.endInsertRows()
+
+    def remove_row(self, row_idx):
+        """Removes just the one row, leaving the rest untouched."""
+        self.beginRemoveRows(QModelIndex(), row_idx, row_idx)
+        del self._rows[row_idx]
+        self.endRemoveRows()
+
+    def update_cell(self, row_idx, col, value):
+        """Changes a single cell and repaints only that cell."""
+        row = list(self._rows[row_idx])
+        row[col] = str(value)
+        self._rows[row_idx] = tuple(row)
+        idx = self.index(row_idx, col)
+        self.dataChanged.emit(idx, idx)
+
+class JobsModel(BaseTableModel):
+    HEADERS = ["Priority", "Customer", "Description", "Status"]
+
+    def renumber(self):
+        """Re-assigns the priority column to 1..N, mirroring what the
+        database does after a delete, without a full refetch."""
+        self._rows = [(str(i),) + tuple(row[1:]) for i, row in enumerate(self._rows, start=1)]
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, 0))
+
+class CustomersModel(BaseTableModel):
+    HEADERS = ["ID", "Name", "Phone", "Email"]
+
+class InventoryModel(BaseTableModel):
+    HEADERS = ["Material", "Quantity"]
+
+    def set_rows(self, rows):
+        """Inventory-specific load: material is already TEXT so it needs
+        no conversion, and format() is quicker than str() on the integer
+        quantity column."""
+        self.beginResetModel()
+        self._rows = [(row["material"], format(row["quantity"])) for row in rows]
+        self.endResetModel()
+
 # -Main program class (GUI)-
 class CarpentryApp(QMainWindow):
     """
@@ -33,10 +118,9 @@ class CarpentryApp(QMainWindow):
 
         # Initialisation Sequence
         self.setup_ui()             # Make the layout
-        self.load_inventory_data()  # Load the inventory data from carpentry.db
-        self.load_customer_data() # Load the customer data from carpentry.db
         self.load_job_data() # Load the job data from carpentry.db
         self.update_completers()    # Initialise the search bar's autocomplete features
+        # The customer and inventory pages load their data when first opened
 
     def setup_ui(self):
         """
@@ -101,17 +185,21 @@ class CarpentryApp(QMainWindow):
         # Search Bar for Jobs
         self.job_search = QLineEdit()
         self.job_search.setPlaceholderText("🔍 Filter jobs by customer...")
-        self.job_search.textChanged.connect(self.load_job_data)
-        
+        self._debounce_search(self.job_search, self.load_job_data)
+
+        # Shared autocomplete models: built once here, then only their
+        # string lists get replaced when the database changes
+        self._mat_model = QStringListModel()
+        self._cust_model = QStringListModel()
+
         # Completer provides the suggestions based on names in the database
-        self.job_search_completer = QCompleter()
-        self.job_search_completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        self.job_search.setCompleter(self.job_search_completer)
+        self._attach_completer(self.job_search, self._cust_model)
         jobs_layout.addWidget(self.job_search)
 
         # Inputs for adding a New Job
         job_input_layout = QHBoxLayout()
         self.job_cust_input = QLineEdit(); self.job_cust_input.setPlaceholderText("Customer Name")
+        self._attach_completer(self.job_cust_input, self._cust_model)
         self.job_desc_input = QLineEdit(); self.job_desc_input.setPlaceholderText("Job Description")
         self.job_status_input = QLineEdit(); self.job_status_input.setPlaceholderText("Status")
 
@@ -140,19 +228,43 @@ class CarpentryApp(QMainWindow):
         jobs_layout.addLayout(job_btn_layout)
 
         # The Table for displaying Jobs
-        self.jobs_table = QTableWidget()
-        self.jobs_table.setColumnCount(4)
-        self.jobs_table.setHorizontalHeaderLabels(["Priority", "Customer", "Description", "Status"])
-        self.jobs_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.jobs_model = JobsModel()
+        self.jobs_table = QTableView()
+        self.jobs_table.setModel(self.jobs_model)
+        self.jobs_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._tune_table(self.jobs_table, [80, 200, 400, 100])
         jobs_layout.addWidget(self.jobs_table)
         self.pages.addWidget(self.jobs_page)
 
-        # -Customer Page-
+        # -Customer & Inventory Pages (lazy)-
+        # Only empty placeholders go in now; the real widgets are built the
+        # first time the user opens each page, which keeps startup fast
         self.customer_page = QWidget()
+        self.inventory_page = QWidget()
+        self.pages.addWidget(self.customer_page)
+        self.pages.addWidget(self.inventory_page)
+        self._pages_built = {0: True, 1: False, 2: False}
+        self.pages.currentChanged.connect(self._build_page_on_demand)
+
+    def _build_page_on_demand(self, index):
+        """Builds a page's widgets and loads its data on first visit."""
+        if not self._pages_built.get(index):
+            self._pages_built[index] = True
+            if index == 1:
+                self._build_customer_page()
+                self.load_customer_data()
+            elif index == 2:
+                self._build_inventory_page()
+                self.load_inventory_data()
+
+    def _build_customer_page(self):
+        """Fills in the Customers page, called on its first activation."""
         cust_layout = QVBoxLayout(self.customer_page)
         cust_layout.addWidget(QLabel("<h2>Customer Database</h2>"))
         self.cust_search = QLineEdit(); self.cust_search.setPlaceholderText("🔍 Search Customers...")
-        self.cust_search.textChanged.connect(self.load_customer_data)
+        self._debounce_search(self.cust_search, self.load_customer_data)
+        # This allows the customer search bar to autocomplete
+        self._attach_completer(self.cust_search, self._cust_model)
         cust_layout.addWidget(self.cust_search)
 
         c_in = QHBoxLayout()
@@ -168,26 +280,28 @@ class CarpentryApp(QMainWindow):
         c_btn.addWidget(btn_sc); c_btn.addWidget(btn_dc)
         cust_layout.addLayout(c_btn)
 
-        self.customer_table = QTableWidget(); self.customer_table.setColumnCount(4)
-        self.customer_table.setHorizontalHeaderLabels(["ID", "Name", "Phone", "Email"])
-        self.customer_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.customer_model = CustomersModel()
+        self.customer_table = QTableView()
+        self.customer_table.setModel(self.customer_model)
+        self.customer_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._tune_table(self.customer_table, [60, 220, 180, 280])
         cust_layout.addWidget(self.customer_table)
-        self.pages.addWidget(self.customer_page)
 
-        # -Inventory Page-
-        self.inventory_page = QWidget()
+    def _build_inventory_page(self):
+        """Fills in the Inventory page, called on its first activation."""
         inv_layout = QVBoxLayout(self.inventory_page)
         inv_layout.addWidget(QLabel("<h2>Inventory Management</h2>"))
         
         t_bar = QHBoxLayout()
         self.inv_search = QLineEdit(); self.inv_search.setPlaceholderText("🔍 Search Inventory...")
-        self.inv_search.textChanged.connect(self.load_inventory_data)
+        self._debounce_search(self.inv_search, self.load_inventory_data)
         btn_exp = QPushButton("Export CSV"); btn_exp.clicked.connect(self.export_to_csv)
         t_bar.addWidget(self.inv_search, 3); t_bar.addWidget(btn_exp, 1)
         inv_layout.addLayout(t_bar)
 
         r_layout = QHBoxLayout()
         self.reg_input = QLineEdit(); self.reg_input.setPlaceholderText("Add material to database...")
+        self._attach_completer(self.reg_input, self._mat_model)
         btn_ar = QPushButton("Add to Database"); btn_ar.clicked.connect(self.add_to_registry_list)
         btn_rr = QPushButton("Remove from database"); btn_rr.clicked.connect(self.remove_from_registry_list)
         r_layout.addWidget(self.reg_input, 2); r_layout.addWidget(btn_ar, 1); r_layout.addWidget(btn_rr, 1)
@@ -195,6 +309,7 @@ class CarpentryApp(QMainWindow):
 
         i_in = QHBoxLayout()
         self.mat_input = QLineEdit(); self.mat_input.setPlaceholderText("Material Name")
+        self._attach_completer(self.mat_input, self._mat_model)
         self.qty_input = QLineEdit(); self.qty_input.setPlaceholderText("Qty")
         i_in.addWidget(self.mat_input, 3); i_in.addWidget(self.qty_input, 1)
         inv_layout.addLayout(i_in)
@@ -209,45 +324,65 @@ class CarpentryApp(QMainWindow):
         i_btn.addWidget(btn_us); i_btn.addWidget(btn_use); i_btn.addWidget(btn_dm)
         inv_layout.addLayout(i_btn)
 
-        self.inventory_table = QTableWidget(); self.inventory_table.setColumnCount(2)
-        self.inventory_table.setHorizontalHeaderLabels(["Material", "Quantity"])
-        self.inventory_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.inventory_model = InventoryModel()
+        self.inventory_table = QTableView()
+        self.inventory_table.setModel(self.inventory_model)
+        self.inventory_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._tune_table(self.inventory_table, [500, 120])
         inv_layout.addWidget(self.inventory_table)
-        self.pages.addWidget(self.inventory_page)
 
     # -Function Logic-
 
+    def _debounce_search(self, search_bar, reload_func):
+        """
+        Connects a search bar to its reload function through a short timer.
+        Typing restarts the timer, so the table only reloads once the user
+        pauses instead of once per keystroke.
+        """
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(150)  # Milliseconds to wait after the last keypress
+        timer.timeout.connect(reload_func)
+        search_bar.textChanged.connect(lambda: timer.start())
+
+    def _tune_table(self, view, widths):
+        """
+        Applies the fast layout settings to a table view: fixed column
+        widths and a fixed row height, so Qt never has to measure every
+        cell's contents to work out the layout after a reload.
+        """
+        view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        for col, width in enumerate(widths):
+            view.setColumnWidth(col, width)
+        view.setWordWrap(False)
+        view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        view.verticalHeader().setDefaultSectionSize(26)
+
+    def _attach_completer(self, widget, model):
+        """Wires a case-insensitive completer onto a widget, done once per widget."""
+        comp = QCompleter(model, widget)
+        comp.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        widget.setCompleter(comp)
+
     def update_completers(self):
         """Refreshes the predictive text lists from the database with Case Insensitivity."""
-        mats = database.get_registry()
-        customers_data = database.get_customers()
-        cust_list = [str(customer[1]) for customer in customers_data] 
-        
-        # Helper to set up completers consistently
-        def set_up_comp(widget, data_list):
-            comp = QCompleter(data_list)
-            comp.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-            widget.setCompleter(comp)
-
-        set_up_comp(self.mat_input, mats)
-        set_up_comp(self.reg_input, mats)
-        set_up_comp(self.job_cust_input, cust_list)
-        
-        # This allows the customer search bar to autocomplete
-        set_up_comp(self.cust_search, cust_list)
-        self.job_search_completer.setModel(QStringListModel(cust_list))
+        # The completers stay attached to their widgets; only the word
+        # lists inside the shared models change
+        self._mat_model.setStringList(database.get_registry())
+        cust_list = [customer["name"] for customer in database.get_customers()]
+        self._cust_model.setStringList(cust_list)
 
     def move_priority(self, direction):
         """Handles moving a job up or down in the list."""
-        row = self.jobs_table.currentRow()
+        row = self.jobs_table.currentIndex().row()
         if row >= 0: # This ensures a row is selected before moving it
-            current_p = int(self.jobs_table.item(row, 0).text())
+            current_p = int(self.jobs_model._rows[row][0])
             new_p = current_p + direction
             database.change_priority(current_p, new_p)
             self.load_job_data()
-            
+
             # This re-selects the row at the new position
-            target_row = max(0, min(row + direction, self.jobs_table.rowCount() - 1))
+            target_row = max(0, min(row + direction, self.jobs_model.rowCount() - 1))
             self.jobs_table.selectRow(target_row)
 
     def save_job(self):
@@ -257,40 +392,42 @@ class CarpentryApp(QMainWindow):
         status = self.job_status_input.text().strip() or "Active" # Default status if empty
         
         if customer and description: # This prevents empty entries
-            database.add_job(customer, description, status)
-            self.load_job_data()
+            new_id = database.add_job(customer, description, status)
+            if self.job_search.text():
+                # A filter is active, so let the query decide what shows
+                self.load_job_data()
+            else:
+                # No filter means we can just append the one new row
+                self.jobs_model.append_row((new_id, customer.title(), description, status))
             self.job_cust_input.clear()
             self.job_desc_input.clear()
 
     def load_job_data(self):
-        """Clears the table and re-populates it based on database records."""
-        self.jobs_table.setRowCount(0)
-        search = self.job_search.text().lower()
-        
-        # Loops through every job returned from the database
-        for row in database.get_all_jobs():
-            if search in str(row[1]).lower():
-                idx = self.jobs_table.rowCount()
-                self.jobs_table.insertRow(idx)
-                # Nested loop to fill the cells of the row
-                for i in range(4): 
-                    self.jobs_table.setItem(idx, i, QTableWidgetItem(str(row[i])))
+        """Re-populates the jobs model based on database records."""
+        # The database filters the rows itself, so only matches come back
+        self.jobs_model.set_rows(database.get_all_jobs(self.job_search.text()))
 
     def update_job_status(self):
         """Updates the status of a specific job ID."""
-        row = self.jobs_table.currentRow()
+        row = self.jobs_table.currentIndex().row()
         ns = self.job_status_input.text().strip()
         if row >= 0 and ns:
-            job_id = self.jobs_table.item(row, 0).text()
+            job_id = self.jobs_model._rows[row][0]
             database.update_job_status(job_id, ns)
-            self.load_job_data()
+            self.jobs_model.update_cell(row, 3, ns)  # Only repaints the status cell
 
     def delete_job(self):
         """Removes a job and triggers the ID re-ordering in the database."""
-        row = self.jobs_table.currentRow()
+        row = self.jobs_table.currentIndex().row()
         if row >= 0:
-            database.delete_job(self.jobs_table.item(row, 0).text())
-            self.load_job_data()
+            database.delete_job(self.jobs_model._rows[row][0])
+            if self.job_search.text():
+                # Filtered view: the visible priorities aren't contiguous,
+                # so re-query rather than renumbering locally
+                self.load_job_data()
+            else:
+                self.jobs_model.remove_row(row)
+                self.jobs_model.renumber()
 
     def save_customer(self):
         """Saves a new customer or updates an existing one with data validation."""
@@ -309,29 +446,17 @@ class CarpentryApp(QMainWindow):
             QMessageBox.warning(self, "Invalid Data", "Customer Name and Phone Number are required.")
 
     def load_customer_data(self):
-        """Populates the customer table with case-insensitive filtering."""
-        self.customer_table.setRowCount(0)
-        status_search = self.cust_search.text().lower()
-        
-        # Converts row items to string
-        for row in database.get_customers():
-            # row[0]=ID, row[1]=Name, row[2]=Phone, row[3]=Email
-            name_text = str(row[1]).lower()
-            phone_text = str(row[2]).lower()
-            
-            # Check if search term is in name or phone
-            if status_search in name_text or status_search in phone_text:
-                idx = self.customer_table.rowCount()
-                self.customer_table.insertRow(idx)
-                for i in range(len(row)): 
-                    self.customer_table.setItem(idx, i, QTableWidgetItem(str(row[i])))
+        """Populates the customer model with case-insensitive filtering."""
+        # The search text matches on either name or phone inside the query
+        self.customer_model.set_rows(database.get_customers(self.cust_search.text()))
 
     def delete_customer(self):
-        row = self.customer_table.currentRow()
+        row = self.customer_table.currentIndex().row()
         if row >= 0:
-            customer_name = self.customer_table.item(row, 1).text()
+            # Model rows are already strings, so no str() wrapper needed
+            customer_name = self.customer_model._rows[row][1]
             database.delete_customer(customer_name)
-            self.load_customer_data()
+            self.customer_model.remove_row(row)
             self.update_completers()
 
     def add_to_registry_list(self):
@@ -354,11 +479,9 @@ class CarpentryApp(QMainWindow):
             QMessageBox.warning(self, "Input Error", "Please provide both material and quantity.")
             return
 
-        registered_mats = [m.lower() for m in database.get_registry()]
-        if material.lower() in registered_mats and quantity.isdigit():
-            # Match the registry's specific casing from the database
-            idx = registered_mats.index(material.lower())
-            actual_name = database.get_registry()[idx]
+        # The cached map gives us the registry's specific casing in one lookup
+        actual_name = database.get_registry_map().get(material.lower())
+        if actual_name and quantity.isdigit():
             database.add_inventory(actual_name, int(quantity))
             self.load_inventory_data()
             self.mat_input.clear()
@@ -369,30 +492,25 @@ class CarpentryApp(QMainWindow):
             QMessageBox.warning(self, "Unknown Material", "This material is not in the database registry.")
 
     def load_inventory_data(self):
-        """Populates the inventory table."""
-        self.inventory_table.setRowCount(0)
-        status = self.inv_search.text().lower()
-        for row in database.get_inventory():
-            if status in row[0].lower():
-                idx = self.inventory_table.rowCount()
-                self.inventory_table.insertRow(idx)
-                self.inventory_table.setItem(idx, 0, QTableWidgetItem(row[0]))
-                self.inventory_table.setItem(idx, 1, QTableWidgetItem(str(row[1])))
+        """Populates the inventory model."""
+        self.inventory_model.set_rows(database.get_inventory(self.inv_search.text()))
 
     def remove_stock(self):
         """Deducts stock from a selected item with insufficient stock feedback."""
-        row = self.inventory_table.currentRow()
+        row = self.inventory_table.currentIndex().row()
         quantity_str = self.qty_input.text().strip()
-        
+
         if row >= 0 and quantity_str.isdigit():
-            material_name = self.inventory_table.item(row, 0).text()
+            material_name = self.inventory_model._rows[row][0]
             quantity_to_use = int(quantity_str)
-            
+
             # Call database to check if use was successful
             success = database.use_inventory(material_name, quantity_to_use)
-            
+
             if success:
-                self.load_inventory_data()
+                # Update just the quantity cell rather than refetching
+                new_qty = int(self.inventory_model._rows[row][1]) - quantity_to_use
+                self.inventory_model.update_cell(row, 1, new_qty)
                 self.qty_input.clear()
             else:
                 QMessageBox.warning(self, "Stock Error", f"Insufficient stock for {material_name}.")
@@ -401,15 +519,21 @@ class CarpentryApp(QMainWindow):
 
     def delete_from_inventory(self):
         """Hard-delete of a material row from the stock table."""
-        row = self.inventory_table.currentRow()
+        row = self.inventory_table.currentIndex().row()
         if row >= 0:
-            database.delete_material(self.inventory_table.item(row, 0).text())
-            self.load_inventory_data()
+            database.delete_material(self.inventory_model._rows[row][0])
+            self.inventory_model.remove_row(row)
 
     def export_to_csv(self):
         """Dumps the current inventory table into a readable CSV file for use on spreadsheets."""
-        with open("inventory_report.csv", "w", newline="") as f:
-            csv.writer(f).writerows(database.get_inventory())
+        # A 64 KiB binary buffer collects the text so the file is written
+        # in big chunks instead of line by line
+        with open("inventory_report.csv", "wb", buffering=65536) as raw:
+            with io.TextIOWrapper(raw, newline="", encoding="utf-8", write_through=False) as f:
+                writer = csv.writer(f)
+                writer.writerow(["Material", "Quantity"])
+                # Rows stream straight from the database cursor to the file
+                writer.writerows(database.iter_inventory())
 
 # -Application Creation-
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import sqlite3
 import os
+import atexit
 
 # -File Path-
 # BASE_DIR = Finds its own location on the device
@@ -7,36 +8,83 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # DB_PATH = Looks one directiory up to find the data folder, holding carpentry.db
 DB_PATH = os.path.abspath(os.path.join(BASE_DIR, "..", "data", "carpentry.db"))
 
-def connect_db():
+# -Shared Connection-
+# One connection is opened on first use and reused for every call,
+# instead of paying the open/close cost on every single query
+_CONN = None
+
+# -Search Queries-
+# The hot search statements live in constants so every keystroke reuses
+# the exact same SQL string and hits the connection's statement cache
+_JOBS_Q = "SELECT id, customer_name, description, status FROM jobs WHERE customer_name LIKE ? COLLATE NOCASE ORDER BY id ASC"
+_CUSTOMERS_Q = "SELECT id, name, phone, email FROM customers WHERE name LIKE ? COLLATE NOCASE OR phone LIKE ? COLLATE NOCASE"
+_INVENTORY_Q = "SELECT material, quantity FROM inventory WHERE material LIKE ? COLLATE NOCASE"
+
+def _get_conn():
     """
-    Creates the data folder if it doesn't exist and opens a connection to the database.
+    Creates the data folder and opens the database connection the first
+    time it is called, then hands back the same connection afterwards.
     """
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    return sqlite3.connect(DB_PATH)
+    global _CONN
+    if _CONN is None:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        # A bigger prepared-statement cache keeps the search queries
+        # compiled between keystrokes
+        _CONN = sqlite3.connect(DB_PATH, cached_statements=256)
+
+        # Rows come back as sqlite3.Row, so callers can use column names
+        # (row["name"]) and skip defensive str() on TEXT columns
+        _CONN.row_factory = sqlite3.Row
+
+        # Bigger pages suit our read-heavy lookups. This only takes effect
+        # when the database file is brand new, so it must run before WAL
+        # mode and before any tables are created (no-op on an existing db)
+        _CONN.execute("PRAGMA page_size=32768")
+
+        # Speed settings: write-ahead logging, relaxed syncing, a bigger
+        # in-memory cache (the number is KiB when negative) and memory
+        # mapping so reads skip the normal file read calls
+        _CONN.execute("PRAGMA journal_mode=WAL")
+        _CONN.execute("PRAGMA synchronous=NORMAL")
+        _CONN.execute("PRAGMA temp_store=MEMORY")
+        _CONN.execute("PRAGMA cache_size=-65536")
+        _CONN.execute("PRAGMA mmap_size=268435456")
+        _CONN.execute("PRAGMA cache_spill=OFF")
+
+        # Makes sure the connection is closed cleanly when the app quits,
+        # letting SQLite refresh its query planner stats first
+        atexit.register(_close_conn)
+    return _CONN
+
+def _close_conn():
+    """Runs at exit: lets SQLite tidy its statistics, then closes up."""
+    if _CONN is not None:
+        _CONN.execute("PRAGMA optimize")
+        _CONN.close()
 
 def setup_tables():
     """
     Runs when the app starts. It makes sure the tables exist.
     """
-    connection = connect_db()
+    connection = _get_conn()
     cursor = connection.cursor()
-    
+
     # Inventory: Stores the materials that are in stock
     cursor.execute("CREATE TABLE IF NOT EXISTS inventory (material TEXT PRIMARY KEY, quantity INTEGER)")
-    
+
     # Registry: A list of allowed materials (prevents typos in the inventory)
     cursor.execute("CREATE TABLE IF NOT EXISTS registry (material_name TEXT PRIMARY KEY)")
-    
+
     # Customers: Basic contact list
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS customers (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT, 
-            phone TEXT, 
+            name TEXT,
+            phone TEXT,
             email TEXT
         )
     """)
-    
+
     # Jobs: The main tracker. The ID (PK) acts as a priority number too
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS jobs (
@@ -46,35 +94,42 @@ def setup_tables():
             status TEXT
         )
     """)
+
+    # Indexes so the search bars can filter inside SQLite instead of Python
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_cust ON jobs(customer_name COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cust_name ON customers(name COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_inv_mat ON inventory(material COLLATE NOCASE)")
+
+    # Customer names must be unique so the add-or-update UPSERT has a
+    # conflict target to land on
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_cust_name ON customers(name)")
     connection.commit()
-    connection.close()
 
 # -Job & Priority Logic-
 
-def reorder_priorities():
+def reorder_priorities(commit=True):
     """
-    This function loops through to make sure it doesnt skip IDs 
-    (if you delete a job, it will start from x again, where x is the lowest number possible)
+    This function makes sure the IDs dont skip numbers
+    (if you delete a job, it will start from x again, where x is the lowest number possible).
+    Callers that are mid-transaction pass commit=False and commit themselves.
     """
-    connection = connect_db()
-    cursor = connection.cursor()
-    cursor.execute("SELECT id FROM jobs ORDER BY id ASC")
-    rows = cursor.fetchall()
-    
-    # Re-assigns IDs based on their current sorted order
-    for index, (old_id,) in enumerate(rows, start=1):
-        cursor.execute("UPDATE jobs SET id = ? WHERE id = ?", (index, old_id))
-    
-    connection.commit()
-    connection.close()
+    connection = _get_conn()
+    cursor = connection.cursor()
+
+    # One statement renumbers every job inside SQLite: each job's new ID
+    # is simply how many jobs have an ID at or below its own, which
+    # closes the gaps without a Python loop of per-row UPDATEs
+    cursor.execute("UPDATE jobs SET id = (SELECT COUNT(*) FROM jobs j2 WHERE j2.id <= jobs.id)")
+    if commit:
+        connection.commit()
 
 def change_priority(old_priority, new_priority):
     """
     This handles the Move Up and Move Down buttons which manages priority.
     """
-    connection = connect_db()
+    connection = _get_conn()
     cursor = connection.cursor()
-    
+
     # Make sure the new priority isn't higher than the total number of jobs
     cursor.execute("SELECT MAX(id) FROM jobs")
     max_priority_row = cursor.fetchone()
@@ -82,9 +137,20 @@ def change_priority(old_priority, new_priority):
     new_priority = max(1, min(new_priority, max_priority))
 
     if old_priority == new_priority:
-        connection.close()
         return
 
+    if abs(old_priority - new_priority) == 1:
+        # Moving one step (the only case the UI buttons produce) is just
+        # a swap of the two neighbouring jobs: park the moving job at the
+        # free ID 0, slide its neighbour across, then drop the parked job
+        # into the new slot. Each statement touches exactly one row
+        cursor.execute("UPDATE jobs SET id = 0 WHERE id = ?", (old_priority,))
+        cursor.execute("UPDATE jobs SET id = ? WHERE id = ?", (old_priority, new_priority))
+        cursor.execute("UPDATE jobs SET id = ? WHERE id = 0", (new_priority,))
+        connection.commit()
+        return
+
+    # Non-adjacent moves still shift the whole range between the two spots
     # Temporary ID 0 is used so we dont have two jobs with the same ID
     cursor.execute("UPDATE jobs SET id = 0 WHERE id = ?", (old_priority,))
 
@@ -97,156 +163,167 @@ def change_priority(old_priority, new_priority):
     # Move the original job from ID 0 to the new priority ID
     cursor.execute("UPDATE jobs SET id = ? WHERE id = 0", (new_priority,))
     connection.commit()
-    connection.close()
 
 def add_job(customer_name, description, status="Active"):
     """Adds a new job to the end of the list."""
-    connection = connect_db()
+    connection = _get_conn()
     cursor = connection.cursor()
-    cursor.execute("SELECT MAX(id) FROM jobs")
-    max_id_row = cursor.fetchone()
-    max_id = max_id_row[0] if max_id_row and max_id_row[0] else 0
-    
+
+    # The next ID is worked out inside the INSERT itself, so there is no
+    # separate MAX(id) query and no gap for another write to sneak into.
     # Uses .title() to make sure names look neat (stuff like "joHn" becomes "John")
-    cursor.execute("INSERT INTO jobs (id, customer_name, description, status) VALUES (?, ?, ?, ?)", 
-                   (max_id + 1, customer_name.title(), description, status))
+    cursor.execute("""
+        INSERT INTO jobs (id, customer_name, description, status)
+        VALUES ((SELECT COALESCE(MAX(id), 0) + 1 FROM jobs), ?, ?, ?)
+    """, (customer_name.title(), description, status))
     connection.commit()
-    connection.close()
+    return cursor.lastrowid  # So the UI can show the new job without a refetch
 
-def get_all_jobs():
-    """Fetches every job from the database, sorted by their priority (ID)."""
-    connection = connect_db()
+def get_all_jobs(search=""):
+    """Fetches jobs matching the search text, sorted by their priority (ID)."""
+    connection = _get_conn()
     cursor = connection.cursor()
-    cursor.execute("SELECT * FROM jobs ORDER BY id ASC")
-    data = cursor.fetchall()
-    connection.close()
-    return data
+    # The database does the filtering itself, so only matching rows come back
+    cursor.execute(_JOBS_Q, (f"%{search}%",))
+    return cursor.fetchall()
 
 def delete_job(job_id):
     """Deletes a job and then starts the re-order function to fix the IDs."""
-    connection = connect_db()
+    connection = _get_conn()
     cursor = connection.cursor()
     cursor.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+    reorder_priorities(commit=False)
+    # One commit covers the delete and the renumber, so other readers
+    # never see the gap and the disk is only synced once
     connection.commit()
-    connection.close()
-    reorder_priorities()
 
 # -Customer Function-
 
 def add_customer(name, phone, email):
     """Adds a customer or updates their info if the name already exists."""
-    connection = connect_db()
-    cursor = connection.cursor()
-    # Check if they exist first by name
-    cursor.execute("SELECT id FROM customers WHERE name = ?", (name.title(),))
-    res = cursor.fetchone()
-    
-    if res:
-        # If they exist, update existing record
-        cursor.execute("UPDATE customers SET phone = ?, email = ? WHERE id = ?", (phone, email, res[0]))
-    else:
-        # If new, let SQLite handle the ID (NULL triggers AUTOINCREMENT)
-        cursor.execute("INSERT INTO customers (id, name, phone, email) VALUES (NULL, ?, ?, ?)", (name.title(), phone, email))
-    
+    connection = _get_conn()
+    cursor = connection.cursor()
+    # One atomic UPSERT: insert the customer, or if the name is already
+    # taken, update their contact details instead
+    cursor.execute("""
+        INSERT INTO customers (name, phone, email) VALUES (?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET phone = excluded.phone, email = excluded.email
+    """, (name.title(), phone, email))
     connection.commit()
-    connection.close()
 
-def get_customers():
-    """Fetches customers with IDs."""
-    connection = connect_db()
+def get_customers(search=""):
+    """Fetches customers with IDs, matching the search text on name or phone."""
+    connection = _get_conn()
     cursor = connection.cursor()
-    cursor.execute("SELECT id, name, phone, email FROM customers")
-    data = cursor.fetchall()
-    connection.close()
-    return data
+    cursor.execute(_CUSTOMERS_Q, (f"%{search}%", f"%{search}%"))
+    return cursor.fetchall()
 
 def delete_customer(name):
     """Deletes by name to match frontend logic."""
-    connection = connect_db()
+    connection = _get_conn()
     cursor = connection.cursor()
     cursor.execute("DELETE FROM customers WHERE name = ?", (name,))
     connection.commit()
-    connection.close()
 
 # -Inventory & Registry Function-
 
+# Cached copy of the registry so lookups don't hit the database every
+# time. Holds three views built in one pass: the sorted proper-name
+# list, its lowercased shadow, and a {lowercase: proper} dict.
+# None means the cache is stale and needs re-reading
+_REGISTRY_CACHE = None
+
+def _load_registry_cache():
+    """Fills the registry cache from the database if it has gone stale."""
+    global _REGISTRY_CACHE
+    if _REGISTRY_CACHE is None:
+        connection = _get_conn()
+        cursor = connection.cursor()
+        cursor.execute("SELECT material_name FROM registry ORDER BY material_name ASC")
+        canon = [row[0] for row in cursor.fetchall()]
+        lowers = [name.lower() for name in canon]
+        _REGISTRY_CACHE = (canon, lowers, dict(zip(lowers, canon)))
+    return _REGISTRY_CACHE
+
 def add_to_registry(name):
     """Adds a material to the list of allowed items."""
-    connection = connect_db()
+    global _REGISTRY_CACHE
+    connection = _get_conn()
     cursor = connection.cursor()
     cursor.execute("INSERT OR IGNORE INTO registry VALUES (?)", (name.title(),))
     connection.commit()
-    connection.close()
+    _REGISTRY_CACHE = None  # Registry changed, so the cache is stale
 
 def remove_from_registry(name):
-    connection = connect_db()
+    global _REGISTRY_CACHE
+    connection = _get_conn()
     cursor = connection.cursor()
     cursor.execute("DELETE FROM registry WHERE material_name = ?", (name,))
     connection.commit()
-    connection.close()
+    _REGISTRY_CACHE = None
+
+def get_registry_map():
+    """
+    Returns the registry as a {lowercase name: proper name} dict. The
+    dict is cached in memory, so repeat calls skip the database entirely
+    until the registry actually changes.
+    """
+    return _load_registry_cache()[2]
 
 def get_registry():
-    connection = connect_db()
-    cursor = connection.cursor()
-    cursor.execute("SELECT material_name FROM registry ORDER BY material_name ASC")
-    # Converts list of tuples into a list of strings
-    data = [row[0] for row in cursor.fetchall()]
-    connection.close()
-    return data
+    """Returns the sorted material list, served from the shared cache."""
+    return _load_registry_cache()[0]
 
 def add_inventory(material, quantity):
     """Updates stock levels, if the item isn't in stock it creates a new entry."""
-    connection = connect_db()
+    connection = _get_conn()
     cursor = connection.cursor()
-    cursor.execute("SELECT quantity FROM inventory WHERE material = ?", (material,))
-    result = cursor.fetchone()
-    
-    if result:
-        # If material exists, add the new amount to the old amount
-        cursor.execute("UPDATE inventory SET quantity = ? WHERE material = ?", (result[0] + quantity, material))
-    else:
-        # If not, create it from scratch
-        cursor.execute("INSERT INTO inventory VALUES (?, ?)", (material, quantity))
-    
+    # Insert the material, or if it already exists, add to its quantity
+    cursor.execute("""
+        INSERT INTO inventory VALUES (?, ?)
+        ON CONFLICT(material) DO UPDATE SET quantity = quantity + excluded.quantity
+    """, (material, quantity))
     connection.commit()
-    connection.close()
 
-def get_inventory():
-    connection = connect_db()
+def get_inventory(search=""):
+    connection = _get_conn()
+    cursor = connection.cursor()
+    cursor.execute(_INVENTORY_Q, (f"%{search}%",))
+    return cursor.fetchall()
+
+def iter_inventory():
+    """
+    Yields inventory rows one at a time for the CSV export, so the whole
+    table never has to sit in memory as one big list.
+    """
+    connection = _get_conn()
     cursor = connection.cursor()
-    cursor.execute("SELECT * FROM inventory")
-    data = cursor.fetchall()
-    connection.close()
-    return data
+    yield from cursor.execute("SELECT * FROM inventory")
 
 def use_inventory(material, quantity):
     """Reduces stock, It checks first to make sure you have enough before subtracting."""
-    connection = connect_db()
+    connection = _get_conn()
     cursor = connection.cursor()
     cursor.execute("SELECT quantity FROM inventory WHERE material = ?", (material,))
     result = cursor.fetchone()
-    
+
     # Logic check to prevent negative stock
     if result and result[0] >= quantity:
         cursor.execute("UPDATE inventory SET quantity = ? WHERE material = ?", (result[0] - quantity, material))
         connection.commit()
-        connection.close()
         return True # Tells the app it was successful
-    
-    connection.close()
+
     return False # Tells the app there wasn't enough stock
 
 def delete_material(name):
-    connection = connect_db()
+    connection = _get_conn()
     cursor = connection.cursor()
     cursor.execute("DELETE FROM inventory WHERE material = ?", (name,))
     connection.commit()
-    connection.close()
 
 def update_job_status(job_id, new_status):
     """Updates the 'Status' column (e.g., 'Finished', 'Pending') for a job."""
-    connection = connect_db()
+    connection = _get_conn()
     cursor = connection.cursor()
     cursor.execute("UPDATE jobs SET status = ? WHERE id = ?", (new_status, job_id))
     connection.commit()
-    connection.close()
\ No newline at end of file